@@ -10,6 +10,29 @@ from typing import Dict, List, Tuple, Optional
 from scipy import stats
 
 
+def _top_n_positions(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Get positions of the n largest values, largest first
+    
+    Uses a partial partition (O(len(values))) and only sorts the n
+    selected values instead of the whole array.
+    
+    Args:
+        values: 1-D numeric array
+        n: Number of positions to return
+        
+    Returns:
+        Array of positions into values
+    """
+    if n <= 0:
+        return np.array([], dtype=np.intp)
+    if n < len(values):
+        positions = np.argpartition(values, -n)[-n:]
+    else:
+        positions = np.arange(len(values))
+    return positions[np.argsort(-values[positions], kind='stable')]
+
+
 class SpendingAnalyzer:
     """Analyze spending patterns and detect anomalies"""
     
@@ -107,12 +130,13 @@ class SpendingAnalyzer:
         Returns:
             DataFrame with anomalous transactions
         """
-        # Calculate Z-scores
-        z_scores = np.abs(stats.zscore(self.df['amount']))
+        # Calculate Z-scores over the raw amount array
+        z_scores = np.abs(stats.zscore(self.df['amount'].to_numpy(dtype=np.float64)))
         
         # Find anomalies
-        anomalies = self.df[z_scores > threshold].copy()
-        anomalies['z_score'] = z_scores[z_scores > threshold]
+        is_anomaly = z_scores > threshold
+        anomalies = self.df[is_anomaly].copy()
+        anomalies['z_score'] = z_scores[is_anomaly]
         anomalies['reason'] = 'Unusually high amount (Z-score > ' + str(threshold) + ')'
         
         return anomalies.sort_values('amount', ascending=False)
@@ -124,8 +148,8 @@ class SpendingAnalyzer:
         Returns:
             DataFrame with anomalous transactions
         """
-        Q1 = self.df['amount'].quantile(0.25)
-        Q3 = self.df['amount'].quantile(0.75)
+        # Both quartiles in one pass over the amounts
+        Q1, Q3 = self.df['amount'].quantile([0.25, 0.75])
         IQR = Q3 - Q1
         
         # Define outlier boundaries
@@ -134,12 +158,13 @@ class SpendingAnalyzer:
         
         # Find anomalies
         anomalies = self.df[
-            (self.df['amount'] < lower_bound) | 
+            (self.df['amount'] < lower_bound) |
             (self.df['amount'] > upper_bound)
         ].copy()
         
-        anomalies['reason'] = anomalies['amount'].apply(
-            lambda x: 'Unusually low' if x < lower_bound else 'Unusually high'
+        # Positional, so duplicate index labels (e.g. concatenated statements) are fine
+        anomalies['reason'] = np.where(
+            anomalies['amount'] < lower_bound, 'Unusually low', 'Unusually high'
         )
         
         return anomalies.sort_values('amount', ascending=False)
@@ -227,7 +252,7 @@ class SpendingAnalyzer:
         }).round(2)
         
         top_merchants.columns = ['Total Spent', 'Transaction Count', 'Average Amount']
-        top_merchants = top_merchants.sort_values('Total Spent', ascending=False).head(n)
+        top_merchants = top_merchants.iloc[_top_n_positions(top_merchants['Total Spent'].to_numpy(), n)]
         
         return top_merchants
     
@@ -315,15 +340,22 @@ class SpendingAnalyzer:
         # Category insights (if available)
         if 'category' in self.df.columns:
             category_summary = self.df.groupby('category')['amount'].agg(['sum', 'count', 'mean']).round(2)
-            insights['top_category'] = category_summary['sum'].idxmax()
-            insights['top_category_amount'] = category_summary['sum'].max()
+            # Locate the top category once and read its label and amount
+            top = category_summary['sum'].argmax()
+            insights['top_category'] = category_summary.index[top]
+            insights['top_category_amount'] = category_summary['sum'].iloc[top]
             insights['category_breakdown'] = category_summary.to_dict()
         
         # Merchant insights
         if 'merchant' in self.df.columns:
-            merchant_summary = self.df.groupby('merchant')['amount'].sum().sort_values(ascending=False)
-            insights['top_merchant'] = merchant_summary.index[0] if len(merchant_summary) > 0 else None
-            insights['top_merchant_amount'] = merchant_summary.iloc[0] if len(merchant_summary) > 0 else 0
+            merchant_summary = self.df.groupby('merchant')['amount'].sum()
+            if len(merchant_summary) > 0:
+                top = merchant_summary.argmax()
+                insights['top_merchant'] = merchant_summary.index[top]
+                insights['top_merchant_amount'] = merchant_summary.iloc[top]
+            else:
+                insights['top_merchant'] = None
+                insights['top_merchant_amount'] = 0
         
         # Anomalies
         anomalies = self.detect_anomalies(method='zscore', threshold=2.5)
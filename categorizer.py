@@ -4,6 +4,7 @@ Automatically categorizes transactions into spending categories
 """
 
 import pandas as pd
+import numpy as np
 import re
 from typing import Dict, List, Optional
 
@@ -126,8 +127,10 @@ class TransactionCategorizer:
         Returns:
             Category name
         """
-        text = f"{merchant} {description}".lower()
-        
+        return self._categorize_text(f"{merchant} {description}".lower())
+    
+    def _categorize_text(self, text: str) -> str:
+        """Return the first category whose keywords appear in text"""
         # Check each category
         for category, pattern in self.category_patterns.items():
             if pattern.search(text):
@@ -152,14 +155,14 @@ class TransactionCategorizer:
         if 'description' not in df.columns:
             df['description'] = ''
         
-        # Categorize each transaction
-        df['category'] = df.apply(
-            lambda row: self.categorize_transaction(
-                str(row['merchant']), 
-                str(row.get('description', ''))
-            ),
-            axis=1
+        # Statements repeat the same merchants many times, so match each
+        # distinct merchant/description text once and broadcast the result
+        texts = df['merchant'].astype(str) + ' ' + df['description'].astype(str)
+        codes, uniques = pd.factorize(texts)
+        categories = np.array(
+            [self._categorize_text(text.lower()) for text in uniques], dtype=object
         )
+        df['category'] = categories[codes]
         
         return df
     
@@ -244,6 +247,19 @@ class TransactionCategorizer:
             self.add_custom_category(category_name, keywords)
 
 
+# Shared categorizer for the convenience functions below, built on first use
+# so the keyword patterns are compiled once per process rather than per call
+_default_categorizer: Optional[TransactionCategorizer] = None
+
+
+def _get_default_categorizer() -> TransactionCategorizer:
+    """Return the shared default TransactionCategorizer"""
+    global _default_categorizer
+    if _default_categorizer is None:
+        _default_categorizer = TransactionCategorizer()
+    return _default_categorizer
+
+
 def categorize_transactions(df: pd.DataFrame) -> pd.DataFrame:
     """
     Categorize transactions in a dataframe
@@ -254,8 +270,7 @@ def categorize_transactions(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with 'category' column added
     """
-    categorizer = TransactionCategorizer()
-    return categorizer.categorize_transactions(df)
+    return _get_default_categorizer().categorize_transactions(df)
 
 
 def get_category_summary(df: pd.DataFrame) -> pd.DataFrame:
@@ -268,8 +283,7 @@ def get_category_summary(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Summary DataFrame
     """
-    categorizer = TransactionCategorizer()
-    return categorizer.get_category_summary(df)
+    return _get_default_categorizer().get_category_summary(df)
 
 
 if __name__ == "__main__":
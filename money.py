@@ -10,12 +10,8 @@ import sys
 import argparse
 from pathlib import Path
 
-# Import modules
-from ocr_extractor import OCRExtractor
-from transaction_parser import TransactionParser
-from categorizer import TransactionCategorizer
-from analyzer import SpendingAnalyzer
-from visualizer import SpendingVisualizer
+# Analysis modules are imported where they are used so that --dashboard
+# and --help do not pay for loading pandas, sklearn, matplotlib, etc.
 
 
 def main():
@@ -72,10 +68,13 @@ Examples:
         return
     
     # Process input file
+    from transaction_parser import TransactionParser
+    
     df = None
     
     if args.pdf:
         print(f"📄 Processing PDF: {args.pdf}")
+        from ocr_extractor import OCRExtractor
         ocr = OCRExtractor(args.tesseract)
         text = ocr.extract_from_pdf(args.pdf)
         
@@ -85,6 +84,7 @@ Examples:
     
     elif args.image:
         print(f"🖼️ Processing image: {args.image}")
+        from ocr_extractor import OCRExtractor
         ocr = OCRExtractor(args.tesseract)
         text = ocr.extract_from_image(args.image)
         
@@ -108,11 +108,13 @@ Examples:
     
     # Categorize transactions
     print("\n🏷️ Categorizing transactions...")
+    from categorizer import TransactionCategorizer
     categorizer = TransactionCategorizer()
     df = categorizer.categorize_transactions(df)
     
     # Analyze
     print("\n📊 Analyzing spending patterns...")
+    from analyzer import SpendingAnalyzer
     analyzer = SpendingAnalyzer(df)
     insights = analyzer.get_insights()
     
@@ -153,6 +155,7 @@ Examples:
             df.to_csv(output_path, index=False)
             print(f"💾 Saved to: {output_path}")
         elif output_path.suffix in ['.xlsx', '.xls']:
+            import pandas as pd
             with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
                 df.to_excel(writer, sheet_name='Transactions', index=False)
                 if 'category' in df.columns:
@@ -164,6 +167,7 @@ Examples:
     # Generate visualizations
     if args.visualize:
         print("\n📈 Generating visualizations...")
+        from visualizer import SpendingVisualizer
         visualizer = SpendingVisualizer(df)
         
         output_dir = Path('visualizations')
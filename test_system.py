@@ -4,9 +4,35 @@ Run this to verify all modules are working correctly
 """
 
 import sys
+import importlib.util
+from functools import lru_cache
 from pathlib import Path
 
-def test_imports():
+
+@lru_cache(maxsize=None)
+def _sample_dataframe():
+    """Build the three-row sample dataframe once per test session"""
+    import pandas as pd
+    
+    sample_data = {
+        'date': ['2024-01-15', '2024-01-16', '2024-01-17'],
+        'merchant': ['Starbucks Coffee', 'Shell Gas Station', 'Netflix'],
+        'amount': [5.75, 52.30, 15.99]
+    }
+    
+    df = pd.DataFrame(sample_data)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+@lru_cache(maxsize=None)
+def _categorizer():
+    """Build the categorizer (and compile its patterns) once per test session"""
+    from categorizer import TransactionCategorizer
+    return TransactionCategorizer()
+
+
+def _check_imports():
     """Test if all modules can be imported"""
     print("🧪 Testing module imports...")
     
@@ -48,7 +74,7 @@ def test_imports():
     return True
 
 
-def test_dependencies():
+def _check_dependencies():
     """Test if all required packages are installed"""
     print("\n🧪 Testing dependencies...")
     
@@ -60,46 +86,30 @@ def test_dependencies():
     all_installed = True
     
     for package in packages:
-        try:
-            if package == 'PIL':
-                import PIL
-            elif package == 'sklearn':
-                import sklearn
-            else:
-                __import__(package)
+        # Look the package up without importing (and initializing) it
+        if importlib.util.find_spec(package) is not None:
             print(f"  ✅ {package}")
-        except ImportError:
+        else:
             print(f"  ❌ {package} (not installed)")
             all_installed = False
     
     return all_installed
 
 
-def test_sample_workflow():
+def _check_sample_workflow():
     """Test the complete workflow with sample data"""
     print("\n🧪 Testing sample workflow...")
     
     try:
-        import pandas as pd
-        from transaction_parser import TransactionParser
-        from categorizer import TransactionCategorizer
         from analyzer import SpendingAnalyzer
         
-        # Create sample data
-        sample_data = {
-            'date': ['2024-01-15', '2024-01-16', '2024-01-17'],
-            'merchant': ['Starbucks Coffee', 'Shell Gas Station', 'Netflix'],
-            'amount': [5.75, 52.30, 15.99]
-        }
-        
-        df = pd.DataFrame(sample_data)
-        df['date'] = pd.to_datetime(df['date'])
+        # Shared sample data; copied because categorizing adds columns in place
+        df = _sample_dataframe().copy()
         
         print("  ✅ Created sample dataframe")
         
         # Categorize
-        categorizer = TransactionCategorizer()
-        df = categorizer.categorize_transactions(df)
+        df = _categorizer().categorize_transactions(df)
         print("  ✅ Categorized transactions")
         
         # Analyze
@@ -121,7 +131,7 @@ def test_sample_workflow():
         return False
 
 
-def test_sample_csv():
+def _check_sample_csv():
     """Test loading the sample CSV file"""
     print("\n🧪 Testing sample CSV...")
     
@@ -147,7 +157,105 @@ def test_sample_csv():
         return False
 
 
-def test_visualizations():
+def _check_csv_chunks():
+    """Test that CSV dates parse the same whatever the chunk size"""
+    print("\n🧪 Testing chunked CSV parsing...")
+    
+    try:
+        import tempfile
+        import pandas as pd
+        from transaction_parser import TransactionParser
+        
+        rows = ['01/02/2024', '15/02/2024', '13/03/2024', '05/04/2024']
+        csv_text = "date,merchant,amount\n" + "".join(
+            f"{date},Shop {i},{i}.00\n" for i, date in enumerate(rows)
+        )
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / 'statement.csv'
+            csv_path.write_text(csv_text)
+            
+            parser = TransactionParser()
+            whole = parser.parse_csv_statement(str(csv_path))
+            assert whole['date'].iloc[-1] == pd.Timestamp('2024-05-04'), "Dates should be month-first"
+            
+            # 15/02 and 13/03 are not month-first, so they are NaT every time
+            for chunksize in (1, 2, 3):
+                chunks = parser.iter_csv_statement(str(csv_path), chunksize=chunksize)
+                dates = pd.concat(chunks)['date']
+                assert dates.equals(whole['date']), f"Dates differ with chunksize={chunksize}"
+        
+        print("  ✅ Dates independent of chunk boundaries")
+        
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
+        return False
+
+
+def _check_statement_lines():
+    """Test that statement text lines are split into merchant and amount"""
+    print("\n🧪 Testing statement line parsing...")
+    
+    try:
+        from transaction_parser import TransactionParser
+        
+        text = "\n".join([
+            "Jan 17, 2024  Rent   1500.00",
+            "01/21/2024 Grocer $1234.56",
+            "01/20/2024 Refund -45.00",
+            "01/22/2024 Shop 12.5",
+            "01/20/2024 Coffee 4.50 CR",
+            "01/16/2024 POS Amazon 1,234.56 USD",
+            # Not a transaction: no leading date
+            "Opening balance 1,000.00",
+        ])
+        df = TransactionParser().parse_transactions(text)
+        amounts = dict(zip(df['merchant'], df['amount']))
+        
+        expected = {
+            'Rent': 1500.00, 'Grocer': 1234.56, 'Refund': -45.00,
+            'Shop': 12.50, 'Coffee': 4.50, 'Amazon': 1234.56,
+        }
+        
+        assert amounts == expected, f"Unexpected transactions: {amounts}"
+        
+        print(f"  ✅ Parsed {len(df)} transaction lines")
+        
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
+        return False
+
+
+def _check_text_dates():
+    """Test that statement text dates are parsed month-first per line"""
+    print("\n🧪 Testing statement date parsing...")
+    
+    try:
+        import pandas as pd
+        from transaction_parser import TransactionParser
+        
+        # A day-first first line must not make later lines day-first too
+        text = "13/01/2024 Shell 40.00\n02/03/2024 Foo 3.00"
+        df = TransactionParser().parse_transactions(text)
+        dates = dict(zip(df['merchant'], df['date']))
+        
+        assert dates['Shell'] == pd.Timestamp('2024-01-13'), "13/01/2024 should be January 13"
+        assert dates['Foo'] == pd.Timestamp('2024-02-03'), "02/03/2024 should be February 3"
+        
+        print("  ✅ Mixed date formats parsed")
+        
+        return True
+        
+    except Exception as e:
+        print(f"  ❌ Error: {e}")
+        return False
+
+
+def _check_visualizations():
     """Test if visualization libraries work"""
     print("\n🧪 Testing visualization capabilities...")
     
@@ -167,6 +275,41 @@ def test_visualizations():
         return False
 
 
+# pytest entry points: the checks above report problems by returning False
+# (so main() can print a summary), which pytest would not treat as a failure
+
+def test_imports():
+    assert _check_imports()
+
+
+def test_dependencies():
+    assert _check_dependencies()
+
+
+def test_sample_workflow():
+    assert _check_sample_workflow()
+
+
+def test_sample_csv():
+    assert _check_sample_csv()
+
+
+def test_csv_chunks():
+    assert _check_csv_chunks()
+
+
+def test_statement_lines():
+    assert _check_statement_lines()
+
+
+def test_text_dates():
+    assert _check_text_dates()
+
+
+def test_visualizations():
+    assert _check_visualizations()
+
+
 def main():
     """Run all tests"""
     print("="*60)
@@ -174,11 +317,14 @@ def main():
     print("="*60)
     
     results = {
-        'Imports': test_imports(),
-        'Dependencies': test_dependencies(),
-        'Sample Workflow': test_sample_workflow(),
-        'Sample CSV': test_sample_csv(),
-        'Visualizations': test_visualizations(),
+        'Imports': _check_imports(),
+        'Dependencies': _check_dependencies(),
+        'Sample Workflow': _check_sample_workflow(),
+        'Sample CSV': _check_sample_csv(),
+        'CSV Chunks': _check_csv_chunks(),
+        'Statement Lines': _check_statement_lines(),
+        'Statement Dates': _check_text_dates(),
+        'Visualizations': _check_visualizations(),
     }
     
     print("\n" + "="*60)
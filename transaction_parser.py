@@ -3,11 +3,43 @@ Transaction Parser Module
 Parses and cleans transaction data from bank statements
 """
 
+from __future__ import annotations
+
 import re
-import pandas as pd
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
-import dateutil.parser
+from typing import TYPE_CHECKING, List, Dict, Iterator, Optional, Tuple
+
+# pandas is imported where it is used, so that importing
+# the parser (e.g. just to parse a few lines of text) stays cheap
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Merchant clean-up and amount patterns, compiled once at import
+_MERCHANT_PREFIX_RE = re.compile(r'^(POS|ATM|ONLINE|DEBIT|CREDIT)\s*', re.IGNORECASE)
+_MERCHANT_SUFFIX_RE = re.compile(r'\s+(LLC|INC|CORP|LTD)\.?$', re.IGNORECASE)
+_AMOUNT_NON_NUMERIC_RE = re.compile(r'[^\d.-]')
+
+# A non-blank line, captured without its surrounding whitespace
+_NONEMPTY_LINE_RE = re.compile(r'^[^\S\n]*(\S.*?)[^\S\n]*$', re.MULTILINE)
+
+
+def _guess_date_format(value: str) -> str:
+    """
+    Guess the strftime format of a date string the way pandas infers it
+    
+    Args:
+        value: Sample date string
+        
+    Returns:
+        The inferred format, or 'mixed' (parse each value on its own) when
+        none can be guessed, as pandas does in that case
+    """
+    try:
+        from pandas.tseries.api import guess_datetime_format
+    except ImportError:  # pandas < 2.2
+        from pandas._libs.tslibs.parsing import guess_datetime_format
+    
+    return guess_datetime_format(value) or 'mixed'
 
 
 class TransactionParser:
@@ -21,17 +53,53 @@ class TransactionParser:
         r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{2,4}',  # Mon DD, YYYY
     ]
     
-    # Amount patterns (including currency symbols)
+    # Exact date formats tried before per-value parsing, month-first like
+    # dateutil's default. Two-digit years are left to per-value parsing,
+    # which picks the century differently from %y
+    DATE_FORMATS = [
+        '%m/%d/%Y', '%m-%d-%Y',
+        '%Y-%m-%d', '%Y/%m/%d',
+        '%d %b %Y', '%d %B %Y',
+        '%b %d, %Y', '%B %d, %Y', '%b %d %Y', '%B %d %Y',
+    ]
+    
+    # Amount patterns (including currency symbols); thousands separators
+    # are optional and a leading minus marks refunds
     AMOUNT_PATTERNS = [
-        r'[\$€£¥₹]\s*\d{1,3}(?:,\d{3})*(?:\.\d{2})?',  # $1,234.56
-        r'\d{1,3}(?:,\d{3})*(?:\.\d{2})?\s*(?:USD|EUR|GBP|INR|RS)',  # 1,234.56 USD
-        r'\d{1,3}(?:,\d{3})*(?:\.\d{2})?',  # 1,234.56
+        r'-?[\$€£¥₹]\s*(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d{1,2})?',  # $1,234.56 or $1234.56
+        r'-?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d{1,2})?\s*(?:USD|EUR|GBP|INR|RS)',  # 1,234.56 USD
+        r'-?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d{1,2})?',  # 1,234.56, 1500.00 or -45.00
     ]
     
-    def __init__(self):
-        """Initialize transaction parser"""
-        self.date_regex = re.compile('|'.join(f'({p})' for p in self.DATE_PATTERNS))
-        self.amount_regex = re.compile('|'.join(f'({p})' for p in self.AMOUNT_PATTERNS))
+    # A transaction line: date, merchant text, amount at the end of the line
+    # (optionally followed by a CR/DR marker). One anchored regex, compiled
+    # once with the class, so non-transaction lines are rejected in one scan
+    _LINE_RE = re.compile(
+        r'(?P<date>' + '|'.join(f'(?:{p})' for p in DATE_PATTERNS) + r')'
+        r'\s+(?P<body>.*?)\s+'
+        r'(?P<amount>' + '|'.join(f'(?:{p})' for p in AMOUNT_PATTERNS) + r')'
+        r'(?:\s*(?i:CR|DR))?$'
+    )
+    
+    # Common CSV column name mappings
+    COLUMN_MAPPINGS = {
+        'date': ['date', 'transaction date', 'posting date', 'trans date'],
+        'merchant': ['merchant', 'description', 'desc', 'payee', 'vendor'],
+        'amount': ['amount', 'debit', 'withdrawal', 'spent', 'charge'],
+    }
+    
+    # Reverse lookup: lowercase column alias -> standard name
+    _COLUMN_ALIASES = {
+        alias: standard_name
+        for standard_name, aliases in COLUMN_MAPPINGS.items()
+        for alias in aliases
+    }
+    
+    # Columns kept after standardization
+    STANDARD_COLUMNS = ['date', 'merchant', 'amount', 'description']
+    
+    # Rows read per chunk from CSV statements
+    CSV_CHUNK_SIZE = 100_000
     
     def parse_transactions(self, text: str) -> pd.DataFrame:
         """
@@ -43,26 +111,33 @@ class TransactionParser:
         Returns:
             DataFrame with columns: date, merchant, amount, description
         """
-        lines = text.split('\n')
-        transactions = []
+        import pandas as pd
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Try to extract transaction information
-            transaction = self._parse_line(line)
-            if transaction:
-                transactions.append(transaction)
+        df = pd.DataFrame.from_records(
+            self.iter_transactions(text), columns=self.STANDARD_COLUMNS
+        )
         
-        if not transactions:
-            return pd.DataFrame(columns=['date', 'merchant', 'amount', 'description'])
+        if df.empty:
+            return df
         
-        df = pd.DataFrame(transactions)
-        df = self._clean_dataframe(df)
+        return self._clean_dataframe(df)
+    
+    def iter_transactions(self, text: str) -> Iterator[Dict]:
+        """
+        Lazily parse transactions from extracted text, one line at a time
         
-        return df
+        Args:
+            text: Raw text from bank statement
+            
+        Yields:
+            Dictionaries with raw date, merchant, amount and description
+        """
+        # Blank lines are skipped and lines stripped by the regex scan itself
+        for line_match in _NONEMPTY_LINE_RE.finditer(text):
+            # Try to extract transaction information
+            transaction = self._parse_line(line_match[1])
+            if transaction:
+                yield transaction
     
     def _parse_line(self, line: str) -> Optional[Dict]:
         """
@@ -74,42 +149,26 @@ class TransactionParser:
         Returns:
             Dictionary with transaction data or None
         """
-        # Look for date
-        date_match = self.date_regex.search(line)
-        if not date_match:
+        # Single pass: date, then merchant text, then the trailing amount
+        match = self._LINE_RE.search(line)
+        if not match:
             return None
         
-        date_str = date_match.group()
-        
-        # Look for amount
-        amount_match = self.amount_regex.search(line)
-        if not amount_match:
-            return None
-        
-        amount_str = amount_match.group()
-        
-        # Extract merchant/description (text between date and amount)
-        date_end = date_match.end()
-        amount_start = amount_match.start()
-        
-        merchant = line[date_end:amount_start].strip()
-        description = line
-        
         # Clean merchant name
-        merchant = self._clean_merchant(merchant)
+        merchant = self._clean_merchant(match['body'])
         
         return {
-            'date': date_str,
+            'date': match['date'],
             'merchant': merchant,
-            'amount': amount_str,
-            'description': description
+            'amount': match['amount'],
+            'description': line
         }
     
     def _clean_merchant(self, merchant: str) -> str:
         """Clean merchant name"""
         # Remove common prefixes/suffixes
-        merchant = re.sub(r'^(POS|ATM|ONLINE|DEBIT|CREDIT)\s*', '', merchant, flags=re.IGNORECASE)
-        merchant = re.sub(r'\s+(LLC|INC|CORP|LTD)\.?$', '', merchant, flags=re.IGNORECASE)
+        merchant = _MERCHANT_PREFIX_RE.sub('', merchant)
+        merchant = _MERCHANT_SUFFIX_RE.sub('', merchant)
         
         # Remove extra whitespace
         merchant = ' '.join(merchant.split())
@@ -126,123 +185,167 @@ class TransactionParser:
         Returns:
             Cleaned dataframe
         """
-        # Parse dates
-        df['date'] = df['date'].apply(self._parse_date)
-        
-        # Parse amounts
-        df['amount'] = df['amount'].apply(self._parse_amount)
-        
-        # Sort by date
-        df = df.sort_values('date', ascending=False)
-        
-        # Reset index
-        df = df.reset_index(drop=True)
-        
-        # Remove duplicates
-        df = df.drop_duplicates(subset=['date', 'merchant', 'amount'], keep='first')
+        import pandas as pd
+        
+        # Parse dates in vectorized passes: the exact DATE_FORMATS first,
+        # then each remaining value's own format read month-first, then
+        # day-first, then today's date as the last resort. Formats are never
+        # inferred from the first row, so one DD/MM line does not flip every
+        # other date in the statement to day-first
+        dates = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+        passes = [{'format': date_format} for date_format in self.DATE_FORMATS]
+        passes += [{'format': 'mixed', 'dayfirst': False}, {'format': 'mixed', 'dayfirst': True}]
+        
+        for options in passes:
+            unparsed = dates.isna()
+            if not unparsed.any():
+                break
+            dates = dates.fillna(pd.to_datetime(df.loc[unparsed, 'date'], errors='coerce', **options))
+        
+        df['date'] = dates.fillna(pd.Timestamp.now())
+        
+        # Parse amounts: plain numbers convert directly, and only the rest
+        # go through the regex clean-up (currency symbols, text and commas)
+        amounts = pd.to_numeric(df['amount'], errors='coerce')
+        needs_cleanup = amounts.isna() & df['amount'].notna()
+        if needs_cleanup.any():
+            cleaned = df.loc[needs_cleanup, 'amount'].astype(str).str.replace(
+                _AMOUNT_NON_NUMERIC_RE, '', regex=True
+            )
+            amounts = amounts.astype('float64').fillna(pd.to_numeric(cleaned, errors='coerce'))
+        df['amount'] = amounts.astype('float64').fillna(0.0)
+        
+        # Sort by date (newest first), skipping the sort when statements
+        # already arrive in that order
+        if not df['date'].is_monotonic_decreasing:
+            df = df.sort_values('date', ascending=False, kind='stable')
+        
+        # Remove duplicates, renumbering the surviving rows in the same pass
+        df = df.drop_duplicates(
+            subset=['date', 'merchant', 'amount'], keep='first', ignore_index=True
+        )
         
         return df
     
-    def _parse_date(self, date_str: str) -> datetime:
-        """
-        Parse date string to datetime object
-        
-        Args:
-            date_str: Date string
-            
-        Returns:
-            datetime object
-        """
-        try:
-            # Try using dateutil parser (handles multiple formats)
-            return dateutil.parser.parse(date_str, dayfirst=False)
-        except:
-            try:
-                # Try with dayfirst=True for DD/MM/YYYY
-                return dateutil.parser.parse(date_str, dayfirst=True)
-            except:
-                # Return today's date as fallback
-                return datetime.now()
-    
-    def _parse_amount(self, amount_str: str) -> float:
+    def parse_csv_statement(self, csv_path: str) -> pd.DataFrame:
         """
-        Parse amount string to float
+        Parse transactions from CSV file
         
         Args:
-            amount_str: Amount string
+            csv_path: Path to CSV file
             
         Returns:
-            Float amount
+            DataFrame with standardized columns
         """
-        # Remove currency symbols and text
-        amount_str = re.sub(r'[^\d,.-]', '', amount_str)
-        
-        # Remove commas
-        amount_str = amount_str.replace(',', '')
+        import pandas as pd
         
         try:
-            return float(amount_str)
-        except:
-            return 0.0
+            return pd.concat(self.iter_csv_statement(csv_path))
+        except Exception as e:
+            raise Exception(f"Error parsing CSV: {str(e)}")
     
-    def parse_csv_statement(self, csv_path: str) -> pd.DataFrame:
+    def iter_csv_statement(self, csv_path: str,
+                           chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
         """
-        Parse transactions from CSV file
+        Parse transactions from CSV file in chunks
+        
+        Only one chunk of the raw file is held in memory at a time, so large
+        statements can be processed without loading them whole.
         
         Args:
             csv_path: Path to CSV file
+            chunksize: Rows per chunk (default: CSV_CHUNK_SIZE)
             
-        Returns:
-            DataFrame with standardized columns
+        Yields:
+            DataFrames with standardized columns
         """
-        try:
-            df = pd.read_csv(csv_path)
-            
-            # Try to identify columns
-            df_cleaned = self._standardize_columns(df)
-            
-            return df_cleaned
-        except Exception as e:
-            raise Exception(f"Error parsing CSV: {str(e)}")
+        import pandas as pd
+        
+        # Read only the header first, then parse just the columns we keep
+        columns = pd.read_csv(csv_path, nrows=0).columns
+        renamed_cols = self._match_columns(columns)
+        
+        usecols = [col for col in columns if renamed_cols.get(col, col) in self.STANDARD_COLUMNS]
+        date_col = next((col for col, name in renamed_cols.items() if name == 'date'), None)
+        
+        # The date format is inferred once, from the file's first date, and
+        # used for every chunk, so dates parse the same wherever the chunk
+        # boundaries fall (and the same as reading the file whole)
+        date_format = None
+        
+        with pd.read_csv(csv_path, usecols=usecols or None,
+                         chunksize=chunksize or self.CSV_CHUNK_SIZE) as reader:
+            for chunk in reader:
+                if date_format is None and date_col is not None:
+                    dates = chunk[date_col].dropna()
+                    if not dates.empty:
+                        date_format = _guess_date_format(str(dates.iloc[0]))
+                
+                # Try to identify columns
+                yield self._standardize_columns(chunk, date_format=date_format)
     
-    def _standardize_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _standardize_columns(self, df: pd.DataFrame,
+                             date_format: Optional[str] = None) -> pd.DataFrame:
         """
         Standardize column names from various bank formats
         
         Args:
             df: Raw dataframe
+            date_format: Format of the date column (default: inferred from
+                its first value)
             
         Returns:
             Dataframe with standard columns
         """
-        # Common column name mappings
-        column_mappings = {
-            'date': ['date', 'transaction date', 'posting date', 'trans date'],
-            'merchant': ['merchant', 'description', 'desc', 'payee', 'vendor'],
-            'amount': ['amount', 'debit', 'withdrawal', 'spent', 'charge'],
-        }
-        
-        renamed_cols = {}
+        import pandas as pd
         
-        for standard_name, variations in column_mappings.items():
-            for col in df.columns:
-                if col.lower().strip() in variations:
-                    renamed_cols[col] = standard_name
-                    break
-        
-        df = df.rename(columns=renamed_cols)
+        df = df.rename(columns=self._match_columns(df.columns))
         
         # Ensure required columns exist
         if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+            df['date'] = pd.to_datetime(df['date'], errors='coerce', format=date_format)
         
         if 'amount' in df.columns:
             df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
         
         # Keep only relevant columns
-        keep_cols = [col for col in ['date', 'merchant', 'amount', 'description'] if col in df.columns]
+        keep_cols = [col for col in self.STANDARD_COLUMNS if col in df.columns]
         
         return df[keep_cols]
+    
+    def _match_columns(self, columns) -> Dict[str, str]:
+        """
+        Map bank-specific column names to standard names
+        
+        Args:
+            columns: Column names from the statement
+            
+        Returns:
+            Dictionary mapping original column names to standard names
+        """
+        renamed_cols = {}
+        matched = set()
+        
+        # One pass over the columns; the first column matching a standard name wins
+        for col in columns:
+            standard_name = self._COLUMN_ALIASES.get(col.lower().strip())
+            if standard_name and standard_name not in matched:
+                renamed_cols[col] = standard_name
+                matched.add(standard_name)
+        
+        return renamed_cols
+
+
+# Shared parser for the convenience functions below, built on first use
+_default_parser: Optional[TransactionParser] = None
+
+
+def _get_default_parser() -> TransactionParser:
+    """Return the shared default TransactionParser"""
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = TransactionParser()
+    return _default_parser
 
 
 def parse_transactions(text: str) -> pd.DataFrame:
@@ -255,8 +358,7 @@ def parse_transactions(text: str) -> pd.DataFrame:
     Returns:
         DataFrame with transaction data
     """
-    parser = TransactionParser()
-    return parser.parse_transactions(text)
+    return _get_default_parser().parse_transactions(text)
 
 
 def parse_csv_statement(csv_path: str) -> pd.DataFrame:
@@ -269,8 +371,7 @@ def parse_csv_statement(csv_path: str) -> pd.DataFrame:
     Returns:
         DataFrame with transaction data
     """
-    parser = TransactionParser()
-    return parser.parse_csv_statement(csv_path)
+    return _get_default_parser().parse_csv_statement(csv_path)
 
 
 if __name__ == "__main__":
@@ -3,18 +3,153 @@ Visualizer Module
 Creates charts and visualizations for spending analysis
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from typing import Optional, Tuple
 import io
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from functools import cached_property, lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def _load_matplotlib():
+    """
+    Import matplotlib and seaborn on first use and apply the chart style
+    
+    Plotting libraries are imported lazily so that callers using only one
+    backend do not pay the import cost of the other, and the result is
+    cached so the style is applied once rather than on every chart.
+    
+    Charts are built as standalone Figure objects rather than through
+    pyplot, so they are never registered with pyplot's global figure manager
+    (which keeps every figure alive until closed) and never start a GUI
+    backend.
+    
+    Returns:
+        Tuple of (Figure class, seaborn module)
+    """
+    import matplotlib
+    from matplotlib.figure import Figure
+    import seaborn as sns
+    
+    # Set style
+    sns.set_style("whitegrid")
+    matplotlib.rcParams['figure.figsize'] = (12, 6)
+    
+    return Figure, sns
+
+
+@lru_cache(maxsize=None)
+def _palette(name: str, n_colors: int) -> Tuple:
+    """
+    Get a seaborn color palette, generated once per (name, size)
+    
+    Args:
+        name: Seaborn palette or matplotlib colormap name
+        n_colors: Number of colors
+        
+    Returns:
+        Tuple of RGB colors
+    """
+    import seaborn as sns
+    return tuple(sns.color_palette(name, n_colors))
 
 
-# Set style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
+def _pie_percents(spending: pd.Series) -> List[str]:
+    """
+    Format each wedge's share of a pie chart as 'NN.N%'
+    
+    Percentages are computed in one vectorized step instead of through a
+    per-wedge autopct formatter.
+    """
+    percents = 100.0 * spending.to_numpy() / spending.sum()
+    return [f"{percent:.1f}%" for percent in percents]
+
+
+def _draw_pie(ax, spending: pd.Series, **kwargs) -> None:
+    """
+    Draw a matplotlib pie chart labelled with names and percentages
+    
+    Names go outside the wedges; the precomputed percentages are drawn
+    inside them, where autopct would put them.
+    
+    Args:
+        ax: Matplotlib axes to draw on
+        spending: Amount per wedge, indexed by name
+        **kwargs: Passed through to ax.pie
+    """
+    wedges, _ = ax.pie(spending.values, labels=spending.index, **kwargs)
+    
+    for wedge, percent in zip(wedges, _pie_percents(spending)):
+        # Same spot as autopct: 60% of the radius out along the wedge's middle
+        angle = np.deg2rad((wedge.theta1 + wedge.theta2) / 2)
+        x = wedge.center[0] + 0.6 * wedge.r * np.cos(angle)
+        y = wedge.center[1] + 0.6 * wedge.r * np.sin(angle)
+        ax.text(x, y, percent, ha='center', va='center', clip_on=False)
+
+
+def _month_keys(dates: pd.Series) -> pd.Series:
+    """
+    Encode dates as integer months (year * 12 + month - 1)
+    
+    Integer keys group through pandas' fast hashtable path, unlike
+    dt.to_period('M') which boxes a Period object per row.
+    """
+    return dates.dt.year * 12 + dates.dt.month - 1
+
+
+def _month_labels(keys) -> List[str]:
+    """Convert integer month keys back to 'YYYY-MM' labels"""
+    return [f"{int(key) // 12}-{int(key) % 12 + 1:02d}" for key in keys]
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Pick points to keep with Largest-Triangle-Three-Buckets downsampling
+    
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket, so peaks survive.
+    
+    Args:
+        x: Sorted x values
+        y: y values
+        n_out: Number of points to keep
+        
+    Returns:
+        Positions of the kept points, in order
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = x.astype('float64')
+    y = y.astype('float64')
+    
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    edges = np.append(edges, n)
+    
+    kept = np.empty(n_out, dtype=np.intp)
+    kept[0], kept[-1] = 0, n - 1
+    
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2]
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Twice the triangle area for every candidate in the bucket
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        kept[i + 1] = prev
+    
+    return kept
 
 
 class SpendingVisualizer:
@@ -27,11 +162,124 @@ class SpendingVisualizer:
         Args:
             df: DataFrame with transaction data
         """
-        self.df = df.copy()
+        # Charts only read the data, so the caller's frame is shared rather
+        # than copied; converting columns swaps in a new frame instead
+        self.df = df
+        
+        conversions = {}
         
         # Ensure date is datetime
-        if 'date' in self.df.columns:
-            self.df['date'] = pd.to_datetime(self.df['date'])
+        if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+            conversions['date'] = pd.to_datetime(df['date'])
+        
+        # Group labels as categoricals, so groupbys hash small integer codes
+        # instead of Python strings
+        for column in ('category', 'merchant'):
+            if column in df.columns and df[column].dtype == object:
+                conversions[column] = df[column].astype('category')
+        
+        if conversions:
+            self.df = df.assign(**conversions)
+        
+        # Per-group sums, built lazily on first chart and reused by every later one
+        self._agg_cache: Dict[Tuple[str, Optional[str]], pd.Series] = {}
+    
+    @cached_property
+    def _amount(self) -> np.ndarray:
+        """Amounts as a contiguous float64 array, missing values counted as 0"""
+        return np.ascontiguousarray(np.nan_to_num(self.df['amount'].to_numpy(dtype='float64')))
+    
+    def _sum_by(self, column: str) -> pd.Series:
+        """
+        Sum amount per value of column, memoized for this visualizer
+        
+        Groups are summed with one np.bincount over the column's factorized
+        codes, bypassing pandas' hash groupby machinery.
+        
+        Args:
+            column: Column to group by
+            
+        Returns:
+            Total amount per group, in order of first appearance
+        """
+        key = (column, None)
+        
+        if key not in self._agg_cache:
+            codes, uniques = pd.factorize(self.df[column], sort=False)
+            
+            # Missing labels get code -1 and are left out, as in groupby
+            observed = codes >= 0
+            totals = np.bincount(
+                codes[observed], weights=self._amount[observed], minlength=len(uniques)
+            )
+            
+            self._agg_cache[key] = pd.Series(
+                totals, index=pd.Index(uniques, name=column), name='amount'
+            )
+        
+        return self._agg_cache[key]
+    
+    @cached_property
+    def _by_date(self) -> pd.Series:
+        """Amounts indexed and sorted by date, shared by every resample"""
+        # Only the amount column is carried over, not a copy of the whole frame
+        amounts = pd.Series(self._amount, index=pd.DatetimeIndex(self.df['date']), name='amount')
+        return amounts.sort_index()
+    
+    def _period_totals(self, freq: str) -> pd.Series:
+        """
+        Sum amount per time period, memoized for this visualizer
+        
+        Args:
+            freq: Pandas frequency string ('D', 'W', 'M', ...)
+            
+        Returns:
+            Total amount per period, indexed by period end
+        """
+        key = ('date', freq)
+        
+        if key not in self._agg_cache:
+            self._agg_cache[key] = self._by_date.resample(freq).sum()
+        
+        return self._agg_cache[key]
+    
+    @cached_property
+    def category_totals(self) -> pd.Series:
+        """Total spending per category, sorted descending"""
+        return self._sum_by('category').sort_values(ascending=False, kind='stable')
+    
+    @cached_property
+    def merchant_totals(self) -> pd.Series:
+        """Total spending per merchant, sorted descending"""
+        return self._sum_by('merchant').sort_values(ascending=False, kind='stable')
+    
+    @cached_property
+    def month_keys(self) -> pd.Series:
+        """Integer month key of every transaction, shared by the monthly charts"""
+        return _month_keys(self.df['date'])
+    
+    @cached_property
+    def monthly_totals(self) -> pd.Series:
+        """Total spending per integer month key, in month order"""
+        return self.df.groupby(self.month_keys)['amount'].sum()
+    
+    def _column_totals(self, column: str) -> pd.Series:
+        """Get spending per value of column, sorted descending"""
+        if column == 'category':
+            return self.category_totals
+        if column == 'merchant':
+            return self.merchant_totals
+        
+        return self._sum_by(column).sort_values(ascending=False, kind='stable')
+    
+    def _top_totals(self, column: str, n: int) -> pd.Series:
+        """
+        Get the n largest spending totals per value of column, largest first
+        
+        Selects with nlargest (a partial heap) instead of sorting every group
+        when only the top of the ranking is shown.
+        """
+        return self._sum_by(column).nlargest(n)
     
     def create_pie_chart(self, column: str = 'category', 
                         title: str = 'Spending by Category',
@@ -51,10 +299,11 @@ class SpendingVisualizer:
             raise ValueError(f"Column '{column}' not found in dataframe")
         
         # Aggregate spending by column
-        spending = self.df.groupby(column)['amount'].sum().sort_values(ascending=False)
+        spending = self._column_totals(column)
         
         if interactive:
             # Create interactive plotly pie chart
+            import plotly.express as px
             fig = px.pie(
                 values=spending.values,
                 names=spending.index,
@@ -65,18 +314,20 @@ class SpendingVisualizer:
             return fig
         else:
             # Create matplotlib pie chart
-            fig, ax = plt.subplots(figsize=(10, 8))
-            colors = sns.color_palette('husl', len(spending))
+            Figure, sns = _load_matplotlib()
+            fig = Figure(figsize=(10, 8))
+            ax = fig.subplots()
+            colors = _palette('husl', len(spending))
             
-            ax.pie(spending.values, labels=spending.index, autopct='%1.1f%%',
-                   startangle=90, colors=colors)
+            _draw_pie(ax, spending, startangle=90, colors=colors)
             ax.set_title(title, fontsize=16, fontweight='bold')
             
             return fig
     
     def create_spending_over_time(self, period: str = 'M',
                                    title: str = 'Spending Over Time',
-                                   interactive: bool = True):
+                                   interactive: bool = True,
+                                   max_points: int = 2000):
         """
         Create line chart for spending over time
         
@@ -84,6 +335,7 @@ class SpendingVisualizer:
             period: Time period ('D' for daily, 'W' for weekly, 'M' for monthly)
             title: Chart title
             interactive: If True, create plotly chart; else matplotlib
+            max_points: Downsample the interactive chart to at most this many points
             
         Returns:
             Plotly figure or matplotlib figure
@@ -92,31 +344,48 @@ class SpendingVisualizer:
             raise ValueError("DataFrame must have 'date' column")
         
         # Aggregate by period
-        spending = self.df.groupby(pd.Grouper(key='date', freq=period))['amount'].sum()
+        spending = self._period_totals(period)
         spending = spending.reset_index()
         
         if interactive:
-            # Create interactive plotly line chart
-            fig = px.line(
-                spending,
-                x='date',
-                y='amount',
+            # Long daily series are downsampled so the browser gets a
+            # bounded payload; matplotlib rasterizes, so it keeps every point
+            if len(spending) > max_points:
+                keep = _lttb_indices(
+                    spending['date'].to_numpy().astype('int64'),
+                    spending['amount'].to_numpy(),
+                    max_points
+                )
+                spending = spending.iloc[keep]
+            
+            # Create interactive plotly line chart, drawn with WebGL so long
+            # daily series stay responsive in the browser
+            import plotly.graph_objects as go
+            fig = go.Figure(go.Scattergl(
+                x=spending['date'],
+                y=spending['amount'],
+                mode='lines+markers',
+                hovertemplate='Date=%{x}<br>Amount ($)=%{y}<extra></extra>'
+            ))
+            fig.update_layout(
                 title=title,
-                labels={'date': 'Date', 'amount': 'Amount ($)'}
+                xaxis_title='Date',
+                yaxis_title='Amount ($)',
+                hovermode='x unified'
             )
-            fig.update_traces(mode='lines+markers')
-            fig.update_layout(hovermode='x unified')
             return fig
         else:
             # Create matplotlib line chart
-            fig, ax = plt.subplots(figsize=(14, 6))
+            Figure, sns = _load_matplotlib()
+            fig = Figure(figsize=(14, 6))
+            ax = fig.subplots()
             ax.plot(spending['date'], spending['amount'], marker='o', linewidth=2)
             ax.set_xlabel('Date', fontsize=12)
             ax.set_ylabel('Amount ($)', fontsize=12)
             ax.set_title(title, fontsize=16, fontweight='bold')
             ax.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
+            ax.tick_params(axis='x', labelrotation=45)
+            fig.tight_layout()
             
             return fig
     
@@ -138,10 +407,11 @@ class SpendingVisualizer:
             raise ValueError("DataFrame must have 'category' column")
         
         # Aggregate by category
-        spending = self.df.groupby('category')['amount'].sum().sort_values(ascending=False).head(top_n)
+        spending = self._top_totals('category', top_n)
         
         if interactive:
             # Create interactive plotly bar chart
+            import plotly.express as px
             fig = px.bar(
                 x=spending.index,
                 y=spending.values,
@@ -154,15 +424,19 @@ class SpendingVisualizer:
             return fig
         else:
             # Create matplotlib bar chart
-            fig, ax = plt.subplots(figsize=(12, 6))
-            colors = sns.color_palette('viridis', len(spending))
+            Figure, sns = _load_matplotlib()
+            fig = Figure(figsize=(12, 6))
+            ax = fig.subplots()
+            colors = _palette('viridis', len(spending))
             ax.bar(spending.index, spending.values, color=colors)
             ax.set_xlabel('Category', fontsize=12)
             ax.set_ylabel('Amount ($)', fontsize=12)
             ax.set_title(title, fontsize=16, fontweight='bold')
-            plt.xticks(rotation=45, ha='right')
+            ax.tick_params(axis='x', labelrotation=45)
+            for label in ax.get_xticklabels():
+                label.set_horizontalalignment('right')
             ax.grid(True, alpha=0.3, axis='y')
-            plt.tight_layout()
+            fig.tight_layout()
             
             return fig
     
@@ -181,35 +455,40 @@ class SpendingVisualizer:
         if 'date' not in self.df.columns:
             raise ValueError("DataFrame must have 'date' column")
         
-        # Extract month and year
-        self.df['month'] = self.df['date'].dt.to_period('M')
-        
         # Aggregate by month
-        monthly = self.df.groupby('month')['amount'].sum().reset_index()
-        monthly['month'] = monthly['month'].astype(str)
+        monthly = self.monthly_totals
+        months = _month_labels(monthly.index)
+        amounts = monthly.to_numpy()
         
         if interactive:
-            # Create interactive plotly bar chart
-            fig = px.bar(
-                monthly,
-                x='month',
-                y='amount',
+            # Create interactive plotly bar chart straight from the arrays
+            # (no intermediate DataFrame as plotly express would build)
+            import plotly.graph_objects as go
+            fig = go.Figure(go.Bar(
+                x=months,
+                y=amounts,
+                marker={'color': amounts, 'coloraxis': 'coloraxis'},
+                hovertemplate='Month=%{x}<br>Amount ($)=%{y}<extra></extra>'
+            ))
+            fig.update_layout(
                 title=title,
-                labels={'month': 'Month', 'amount': 'Amount ($)'},
-                color='amount',
-                color_continuous_scale='Blues'
+                xaxis_title='Month',
+                yaxis_title='Amount ($)',
+                coloraxis={'colorscale': 'Blues', 'colorbar': {'title': {'text': 'Amount ($)'}}}
             )
             return fig
         else:
             # Create matplotlib bar chart
-            fig, ax = plt.subplots(figsize=(14, 6))
-            ax.bar(monthly['month'], monthly['amount'], color='steelblue')
+            Figure, sns = _load_matplotlib()
+            fig = Figure(figsize=(14, 6))
+            ax = fig.subplots()
+            ax.bar(months, amounts, color='steelblue')
             ax.set_xlabel('Month', fontsize=12)
             ax.set_ylabel('Amount ($)', fontsize=12)
             ax.set_title(title, fontsize=16, fontweight='bold')
-            plt.xticks(rotation=45)
+            ax.tick_params(axis='x', labelrotation=45)
             ax.grid(True, alpha=0.3, axis='y')
-            plt.tight_layout()
+            fig.tight_layout()
             
             return fig
     
@@ -231,10 +510,11 @@ class SpendingVisualizer:
             raise ValueError("DataFrame must have 'merchant' column")
         
         # Aggregate by merchant
-        merchants = self.df.groupby('merchant')['amount'].sum().sort_values(ascending=False).head(top_n)
+        merchants = self._top_totals('merchant', top_n)
         
         if interactive:
             # Create interactive plotly horizontal bar chart
+            import plotly.express as px
             fig = px.bar(
                 x=merchants.values,
                 y=merchants.index,
@@ -248,14 +528,16 @@ class SpendingVisualizer:
             return fig
         else:
             # Create matplotlib horizontal bar chart
-            fig, ax = plt.subplots(figsize=(10, 8))
-            colors = sns.color_palette('YlOrRd', len(merchants))
+            Figure, sns = _load_matplotlib()
+            fig = Figure(figsize=(10, 8))
+            ax = fig.subplots()
+            colors = _palette('YlOrRd', len(merchants))
             ax.barh(merchants.index, merchants.values, color=colors)
             ax.set_xlabel('Amount ($)', fontsize=12)
             ax.set_ylabel('Merchant', fontsize=12)
             ax.set_title(title, fontsize=16, fontweight='bold')
             ax.grid(True, alpha=0.3, axis='x')
-            plt.tight_layout()
+            fig.tight_layout()
             
             return fig
     
@@ -274,21 +556,33 @@ class SpendingVisualizer:
         if 'category' not in self.df.columns or 'date' not in self.df.columns:
             raise ValueError("DataFrame must have 'category' and 'date' columns")
         
-        # Create pivot table
-        self.df['month'] = self.df['date'].dt.to_period('M')
-        pivot = self.df.pivot_table(
-            values='amount',
-            index='category',
-            columns='month',
-            aggfunc='sum',
-            fill_value=0
+        # Accumulate the category x month matrix with one bincount over
+        # flattened (category, month) codes instead of a pivot_table
+        months = self.month_keys
+        valid = (self.df['category'].notna() & months.notna()).to_numpy()
+        cat_codes, categories = pd.factorize(self.df['category'][valid], sort=True)
+        month_codes, month_keys = pd.factorize(months[valid], sort=True)
+        
+        matrix = np.bincount(
+            cat_codes * len(month_keys) + month_codes,
+            weights=self._amount[valid],
+            minlength=len(categories) * len(month_keys)
+        ).reshape(len(categories), len(month_keys))
+        
+        # Sums are accumulated in float64; the colors and whole-dollar labels
+        # only need float32, which halves the matrix and its plotly payload
+        matrix = matrix.astype('float32', copy=False)
+        
+        # Label month keys for plotting
+        pivot = pd.DataFrame(
+            matrix,
+            index=pd.Index(categories, name='category'),
+            columns=_month_labels(month_keys)
         )
         
-        # Convert period to string for plotting
-        pivot.columns = pivot.columns.astype(str)
-        
         if interactive:
             # Create interactive plotly heatmap
+            import plotly.express as px
             fig = px.imshow(
                 pivot,
                 title=title,
@@ -299,10 +593,12 @@ class SpendingVisualizer:
             return fig
         else:
             # Create matplotlib heatmap
-            fig, ax = plt.subplots(figsize=(14, 8))
+            Figure, sns = _load_matplotlib()
+            fig = Figure(figsize=(14, 8))
+            ax = fig.subplots()
             sns.heatmap(pivot, annot=True, fmt='.0f', cmap='YlOrRd', ax=ax, cbar_kws={'label': 'Amount ($)'})
             ax.set_title(title, fontsize=16, fontweight='bold')
-            plt.tight_layout()
+            fig.tight_layout()
             
             return fig
     
@@ -316,33 +612,49 @@ class SpendingVisualizer:
         Returns:
             Matplotlib figure with subplots
         """
-        fig = plt.figure(figsize=(18, 12))
+        Figure, sns = _load_matplotlib()
+        
+        # One grouped pass per key, shared by every panel and the summary;
+        # only the top few groups are ever shown, so they are selected
+        # rather than fully sorted
+        has_category = 'category' in self.df.columns
+        has_merchant = 'merchant' in self.df.columns
+        category_totals = self._top_totals('category', 8) if has_category else None
+        merchant_totals = self._top_totals('merchant', 6) if has_merchant else None
+        
+        fig = Figure(figsize=(18, 12))
         gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
         
         # 1. Pie chart - Spending by category
-        if 'category' in self.df.columns:
+        if has_category:
             ax1 = fig.add_subplot(gs[0, 0])
-            spending = self.df.groupby('category')['amount'].sum().sort_values(ascending=False).head(8)
-            colors = sns.color_palette('Set2', len(spending))
-            ax1.pie(spending.values, labels=spending.index, autopct='%1.1f%%', colors=colors)
+            spending = category_totals.head(8)
+            colors = _palette('Set2', len(spending))
+            _draw_pie(ax1, spending, colors=colors)
             ax1.set_title('Spending by Category', fontweight='bold', fontsize=12)
         
         # 2. Line chart - Spending over time
         if 'date' in self.df.columns:
             ax2 = fig.add_subplot(gs[0, 1])
-            monthly = self.df.groupby(pd.Grouper(key='date', freq='M'))['amount'].sum()
-            ax2.plot(monthly.index, monthly.values, marker='o', linewidth=2, color='steelblue')
+            monthly = self.monthly_totals
+            # Fill months without transactions so the trend line stays continuous
+            keys = pd.RangeIndex(int(monthly.index.min()), int(monthly.index.max()) + 1)
+            monthly = monthly.reindex(keys, fill_value=0)
+            month_ends = pd.to_datetime(pd.DataFrame({
+                'year': keys // 12, 'month': keys % 12 + 1, 'day': 1
+            })) + pd.offsets.MonthEnd(0)
+            ax2.plot(month_ends, monthly.values, marker='o', linewidth=2, color='steelblue')
             ax2.set_title('Monthly Spending Trend', fontweight='bold', fontsize=12)
             ax2.set_xlabel('Date')
             ax2.set_ylabel('Amount ($)')
             ax2.grid(True, alpha=0.3)
-            plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45)
+            ax2.tick_params(axis='x', labelrotation=45)
         
         # 3. Bar chart - Top categories
-        if 'category' in self.df.columns:
+        if has_category:
             ax3 = fig.add_subplot(gs[1, 0])
-            top_cats = self.df.groupby('category')['amount'].sum().sort_values(ascending=False).head(6)
-            ax3.bar(range(len(top_cats)), top_cats.values, color=sns.color_palette('viridis', len(top_cats)))
+            top_cats = category_totals.head(6)
+            ax3.bar(range(len(top_cats)), top_cats.values, color=_palette('viridis', len(top_cats)))
             ax3.set_xticks(range(len(top_cats)))
             ax3.set_xticklabels(top_cats.index, rotation=45, ha='right')
             ax3.set_title('Top Spending Categories', fontweight='bold', fontsize=12)
@@ -350,9 +662,9 @@ class SpendingVisualizer:
             ax3.grid(True, alpha=0.3, axis='y')
         
         # 4. Horizontal bar - Top merchants
-        if 'merchant' in self.df.columns:
+        if has_merchant:
             ax4 = fig.add_subplot(gs[1, 1])
-            top_merchants = self.df.groupby('merchant')['amount'].sum().sort_values(ascending=True).tail(6)
+            top_merchants = merchant_totals.head(6).iloc[::-1]
             ax4.barh(range(len(top_merchants)), top_merchants.values, color='coral')
             ax4.set_yticks(range(len(top_merchants)))
             ax4.set_yticklabels(top_merchants.index)
@@ -364,47 +676,76 @@ class SpendingVisualizer:
         ax5 = fig.add_subplot(gs[2, :])
         ax5.axis('off')
         
+        # All amount statistics in one agg call
+        amount_stats = self.df['amount'].agg(['sum', 'mean', 'max', 'min'])
+        
         stats_text = f"""
         📊 SPENDING SUMMARY
         ═══════════════════════════════════════════════════════════════
         
         Total Transactions: {len(self.df):,}
-        Total Spent: ${self.df['amount'].sum():,.2f}
-        Average Transaction: ${self.df['amount'].mean():,.2f}
-        Largest Transaction: ${self.df['amount'].max():,.2f}
-        Smallest Transaction: ${self.df['amount'].min():,.2f}
+        Total Spent: ${amount_stats['sum']:,.2f}
+        Average Transaction: ${amount_stats['mean']:,.2f}
+        Largest Transaction: ${amount_stats['max']:,.2f}
+        Smallest Transaction: ${amount_stats['min']:,.2f}
         """
         
-        if 'category' in self.df.columns:
-            top_cat = self.df.groupby('category')['amount'].sum().idxmax()
-            top_cat_amt = self.df.groupby('category')['amount'].sum().max()
+        # Top totals are largest first, so the top entry is the first one
+        if has_category:
+            top_cat, top_cat_amt = category_totals.index[0], category_totals.iloc[0]
             stats_text += f"\nTop Category: {top_cat} (${top_cat_amt:,.2f})"
         
-        if 'merchant' in self.df.columns:
-            top_merch = self.df.groupby('merchant')['amount'].sum().idxmax()
-            top_merch_amt = self.df.groupby('merchant')['amount'].sum().max()
+        if has_merchant:
+            top_merch, top_merch_amt = merchant_totals.index[0], merchant_totals.iloc[0]
             stats_text += f"\nTop Merchant: {top_merch} (${top_merch_amt:,.2f})"
         
         ax5.text(0.1, 0.5, stats_text, fontsize=11, family='monospace',
                 verticalalignment='center', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.3))
         
         if output_path:
-            plt.savefig(output_path, dpi=300, bbox_inches='tight')
+            fig.savefig(output_path, dpi=300, bbox_inches='tight')
         
         return fig
 
 
-def create_spending_charts(df: pd.DataFrame, interactive: bool = True) -> dict:
+# Serialized chart sets from create_spending_charts(prejson=True), keyed by
+# a fingerprint of the input data, most recently used last; shared across
+# threads (e.g. Streamlit sessions), so access goes through the lock
+_CHART_JSON_CACHE: 'OrderedDict[Tuple, Dict[str, str]]' = OrderedDict()
+_CHART_JSON_CACHE_SIZE = 8
+_CHART_JSON_CACHE_LOCK = threading.Lock()
+
+
+def _frame_fingerprint(df: pd.DataFrame) -> Tuple:
+    """Fingerprint a dataframe's columns and contents for caching"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False)
+    return tuple(df.columns), len(df), int(row_hashes.sum())
+
+
+def create_spending_charts(df: pd.DataFrame, interactive: bool = True,
+                           prejson: bool = False) -> dict:
     """
     Create all standard spending charts
     
     Args:
         df: DataFrame with transaction data
         interactive: If True, create plotly charts; else matplotlib
+        prejson: If True (interactive only), return each chart as a plotly
+            JSON string, cached so the same data is only charted once
         
     Returns:
-        Dictionary of chart figures
+        Dictionary of chart figures (or JSON strings with prejson)
     """
+    prejson = prejson and interactive
+    
+    if prejson:
+        fingerprint = _frame_fingerprint(df)
+        with _CHART_JSON_CACHE_LOCK:
+            cached = _CHART_JSON_CACHE.get(fingerprint)
+            if cached is not None:
+                _CHART_JSON_CACHE.move_to_end(fingerprint)
+                return dict(cached)
+    
     visualizer = SpendingVisualizer(df)
     
     charts = {}
@@ -420,9 +761,41 @@ def create_spending_charts(df: pd.DataFrame, interactive: bool = True) -> dict:
     if 'merchant' in df.columns:
         charts['top_merchants'] = visualizer.create_top_merchants_chart(interactive=interactive)
     
+    if prejson:
+        # Figures were validated as they were built; skip it on serialization
+        import plotly.io as pio
+        charts = {
+            name: pio.to_json(fig, validate=False, pretty=False)
+            for name, fig in charts.items()
+        }
+        
+        with _CHART_JSON_CACHE_LOCK:
+            _CHART_JSON_CACHE[fingerprint] = charts
+            if len(_CHART_JSON_CACHE) > _CHART_JSON_CACHE_SIZE:
+                _CHART_JSON_CACHE.popitem(last=False)
+        charts = dict(charts)
+    
     return charts
 
 
+def to_png_bytes(fig, dpi: int = 100) -> bytes:
+    """
+    Render a matplotlib chart to PNG bytes
+    
+    Useful for serving charts from a web app without touching the disk.
+    
+    Args:
+        fig: Matplotlib figure
+        dpi: Output resolution
+        
+    Returns:
+        PNG image data
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
 if __name__ == "__main__":
     # Test the module
     print("Spending Visualizer Module")